@@ -1,60 +1,260 @@
 import time
-from web3 import Web3
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3, HTTPProvider, __version__ as web3_version
+from web3.providers.base import JSONBaseProvider
+from eth_typing import ChecksumAddress
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, Union, Callable
+
+# 安装了 orjson 时用它解析 JSON（ABI 和 RPC 响应），否则退回标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# 合约 ABI
+_ABI_JSON = '''[{"inputs":[{"internalType":"address","name":"jager","type":"address"},{"internalType":"address","name":"airdropAddress","type":"address"}],"stateMutability":"nonpayable","type":"constructor"},{"inputs":[],"name":"LPToken","outputs":[{"internalType":"contract IERC20","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"tokenAmount","type":"uint256"}],"name":"addLiquidity","outputs":[],"stateMutability":"payable","type":"function"},{"inputs":[{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"addReward","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"airdrop","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"claim","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"deposit","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"endBlock","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"jagerToken","outputs":[{"internalType":"contract IJagerHunter","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"lockTime","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"pendingReward","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"poolInfo","outputs":[{"internalType":"uint256","name":"accLPPerShare","type":"uint256"},{"internalType":"uint256","name":"totalAmount","type":"uint256"},{"internalType":"uint256","name":"lastRewardBlock","type":"uint256"},{"internalType":"uint256","name":"totalReward","type":"uint256"},{"internalType":"uint256","name":"releaseReward","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"releaseBlockNumber","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"rewardPerBlock","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"updatePool","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"","type":"address"}],"name":"userInfo","outputs":[{"internalType":"uint256","name":"amount","type":"uint256"},{"internalType":"uint256","name":"rewardDebt","type":"uint256"},{"internalType":"uint256","name":"pending","type":"uint256"},{"internalType":"uint256","name":"lockEndedTimestamp","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"withdraw","outputs":[],"stateMutability":"nonpayable","type":"function"},{"stateMutability":"payable","type":"receive"}]'''
+
+# 只在导入时解析一次，所有实例共享
+_ABI = _json_loads(_ABI_JSON)
+
+# 可能被管理员修改的参数（endBlock 等）的缓存有效期（秒）
+_SLOW_VIEW_TTL = 3600
+
+# gasPrice 缓存有效期（秒）
+_GAS_PRICE_TTL = 10
+
+# 在 estimate_gas 结果上预留的余量
+_GAS_LIMIT_MULTIPLIER = 1.2
+
+# 等待交易回执的轮询间隔（秒），默认的 0.1 秒在 BSC 出块间隔下会产生大量无效请求
+_RECEIPT_POLL_LATENCY = 1
+
+# 估算出块间隔时采样的区块数
+_BLOCK_TIME_SAMPLE = 200
+
+# RPC 节点请求失败后暂停使用的时间（秒）
+_ENDPOINT_COOLDOWN = 30
+
+# RPC 节点延迟指数移动平均的平滑系数
+_LATENCY_EMA_ALPHA = 0.3
+
+# 表示节点暂时不可用、需要切换节点的 JSON-RPC 错误码（EIP-1474）：
+# -32002 资源不可用，-32005 超出请求频率限制
+_UNAVAILABLE_RPC_ERROR_CODES = {-32002, -32005}
+
+# 已安装的 Web3.py 主版本号
+_WEB3_MAJOR_VERSION = int(web3_version.split('.')[0])
+
+# Web3.py v7 起签名交易的原始数据字段由 rawTransaction 更名为 raw_transaction
+_RAW_TX_ATTR = 'raw_transaction' if _WEB3_MAJOR_VERSION >= 7 else 'rawTransaction'
+
+# pendingReward(address) 的函数选择器，用于直接拼接 calldata
+_PENDING_REWARD_SELECTOR = bytes(Web3.keccak(text="pendingReward(address)")[:4])
+
+
+class _EndpointUnavailable(Exception):
+    """RPC 节点返回了限流或暂时不可用的错误"""
+
+
+def _is_unavailable_error(response: Any) -> bool:
+    """判断 JSON-RPC 响应是否为限流或节点暂时不可用的错误"""
+    if not isinstance(response, dict):
+        return False
+    error = response.get("error")
+    return isinstance(error, dict) and error.get("code") in _UNAVAILABLE_RPC_ERROR_CODES
+
+
+class RPCLoadBalancer(JSONBaseProvider):
+    """
+    多个 RPC 节点之间的负载均衡 Provider
+    
+    每次请求发往平均延迟最低的可用节点；节点请求失败或返回限流错误时在
+    _ENDPOINT_COOLDOWN 秒内不再使用，并立即改用下一个节点重试。
+    """
+    
+    def __init__(self, rpc_urls: List[str], session: requests.Session, request_kwargs: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            rpc_urls: RPC 节点 URL 列表
+            session: 所有节点共用的 HTTP Session
+            request_kwargs: 传给 requests 的额外参数（如 timeout）
+        """
+        super().__init__()
+        if not rpc_urls:
+            raise Exception("至少需要提供一个 RPC 节点 URL")
+        
+        self.request_kwargs = request_kwargs or {}
+        provider_kwargs = {"session": session, "request_kwargs": self.request_kwargs}
+        if _WEB3_MAJOR_VERSION >= 7:
+            # v7 的 HTTPProvider 默认会对失败请求自带多次重试，这里关闭，由 route 立即切换节点
+            provider_kwargs["exception_retry_configuration"] = None
+        
+        self.endpoints = [
+            {
+                "url": url,
+                "provider": HTTPProvider(url, **provider_kwargs),
+                "ema_latency": 0.0,  # 0 表示尚未测量，会被优先尝试
+                "unhealthy_until": 0.0,
+                "batch_supported": True,  # 节点拒绝 JSON-RPC 批量请求后置为 False
+            }
+            for url in rpc_urls
+        ]
+        if orjson is not None:
+            for endpoint in self.endpoints:
+                endpoint["provider"].decode_rpc_response = orjson.loads
+    
+    def route(self, send: Callable[[Dict[str, Any]], Any], endpoints: Optional[List[Dict[str, Any]]] = None) -> Any:
+        """
+        选择节点执行请求，失败时自动切换节点
+        
+        Args:
+            send: 接收节点信息并发送请求的函数
+            endpoints: 可选的候选节点，默认为全部节点
+        """
+        endpoints = self.endpoints if endpoints is None else endpoints
+        now = time.monotonic()
+        healthy = [endpoint for endpoint in endpoints if endpoint["unhealthy_until"] <= now]
+        # 所有节点都在冷却中时仍按延迟依次尝试
+        candidates = sorted(healthy or endpoints, key=lambda endpoint: endpoint["ema_latency"])
+        
+        last_error = None
+        for endpoint in candidates:
+            start = time.monotonic()
+            try:
+                result = send(endpoint)
+            except (requests.RequestException, ValueError, _EndpointUnavailable) as e:
+                # 连接失败、HTTP 错误、返回内容无法解析为 JSON 或节点限流
+                endpoint["unhealthy_until"] = time.monotonic() + _ENDPOINT_COOLDOWN
+                last_error = e
+                continue
+            
+            # 返回错误的响应（如交易 revert）不代表节点的正常延迟，不计入统计
+            if isinstance(result, dict) and "error" in result:
+                return result
+            
+            latency = time.monotonic() - start
+            if endpoint["ema_latency"] == 0.0:
+                endpoint["ema_latency"] = latency
+            else:
+                endpoint["ema_latency"] += _LATENCY_EMA_ALPHA * (latency - endpoint["ema_latency"])
+            return result
+        
+        raise last_error
+    
+    def make_request(self, method, params):
+        def send(endpoint: Dict[str, Any]) -> Any:
+            response = endpoint["provider"].make_request(method, params)
+            if _is_unavailable_error(response):
+                raise _EndpointUnavailable(f"RPC 节点 {endpoint['url']} 暂时不可用: {response['error']}")
+            return response
+        
+        return self.route(send)
+
 
 class JagerContractInteraction:
-    def __init__(self, contract_address: str, rpc_url: str, private_key: Optional[str] = None):
+    def __init__(self, contract_address: str, rpc_url: Union[str, List[str]], private_key: Optional[str] = None):
         """
         初始化合约交互类
         
         Args:
             contract_address: 合约地址
-            rpc_url: BSC RPC URL
+            rpc_url: BSC RPC URL，可传入多个 URL 的列表，请求会自动选择最快的可用节点
             private_key: 私钥（用于发送交易）
         """
         self.contract_address = Web3.to_checksum_address(contract_address)
-        self.web3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.rpc_urls = [rpc_url] if isinstance(rpc_url, str) else list(rpc_url)
+        
+        # 复用同一个 Session 保持长连接，避免每次请求重新进行 TCP/TLS 握手
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.rpc_urls), pool_maxsize=4)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.provider = RPCLoadBalancer(self.rpc_urls, self.session, request_kwargs={'timeout': 10})
+        self.web3 = Web3(self.provider)
         self.private_key = private_key
+        self.account = self.web3.eth.account.from_key(private_key) if private_key else None
+        
+        # 发送交易所需的链上参数缓存
+        self._chain_id: Optional[int] = None
+        self._gas_price: Optional[Tuple[int, float]] = None  # (gasPrice, 过期时间)
+        self._nonce: Optional[int] = None  # 本地维护，发送成功后递增
         
-        # 合约 ABI
-        self.abi = json.loads('''[{"inputs":[{"internalType":"address","name":"jager","type":"address"},{"internalType":"address","name":"airdropAddress","type":"address"}],"stateMutability":"nonpayable","type":"constructor"},{"inputs":[],"name":"LPToken","outputs":[{"internalType":"contract IERC20","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"tokenAmount","type":"uint256"}],"name":"addLiquidity","outputs":[],"stateMutability":"payable","type":"function"},{"inputs":[{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"addReward","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"airdrop","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"claim","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"deposit","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"endBlock","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"jagerToken","outputs":[{"internalType":"contract IJagerHunter","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"lockTime","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"pendingReward","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"poolInfo","outputs":[{"internalType":"uint256","name":"accLPPerShare","type":"uint256"},{"internalType":"uint256","name":"totalAmount","type":"uint256"},{"internalType":"uint256","name":"lastRewardBlock","type":"uint256"},{"internalType":"uint256","name":"totalReward","type":"uint256"},{"internalType":"uint256","name":"releaseReward","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"releaseBlockNumber","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"rewardPerBlock","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"updatePool","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"","type":"address"}],"name":"userInfo","outputs":[{"internalType":"uint256","name":"amount","type":"uint256"},{"internalType":"uint256","name":"rewardDebt","type":"uint256"},{"internalType":"uint256","name":"pending","type":"uint256"},{"internalType":"uint256","name":"lockEndedTimestamp","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"withdraw","outputs":[],"stateMutability":"nonpayable","type":"function"},{"stateMutability":"payable","type":"receive"}]''')
+        # 合约 ABI（模块加载时已解析）
+        self.abi = _ABI
         
         # 初始化合约
         self.contract = self.web3.eth.contract(address=self.contract_address, abi=self.abi)
         
+        # 不常变化的 view 结果缓存 {函数名: (值, 过期时间)}
+        self._view_cache: Dict[str, Tuple[Any, Optional[float]]] = {}
+        # 预先编码好的 pendingReward 调用 {账户地址: eth_call 参数}
+        self._pending_reward_calls: Dict[str, Dict[str, str]] = {}
+        # 实测的平均出块间隔 (秒, 过期时间)
+        self._block_time: Optional[Tuple[float, float]] = None
+        
         # 检查连接
         if not self.web3.is_connected():
             raise Exception("无法连接到 BSC 网络")
     
+    def _cached_view(self, fn_name: str, ttl: Optional[float] = None) -> Any:
+        """
+        查询无参数的 view 函数并缓存结果
+        
+        Args:
+            fn_name: 函数名
+            ttl: 缓存有效期（秒），None 表示永久缓存
+        """
+        now = time.monotonic()
+        cached = self._view_cache.get(fn_name)
+        if cached is not None and (cached[1] is None or now < cached[1]):
+            return cached[0]
+        
+        value = self.contract.functions[fn_name]().call()
+        self._view_cache[fn_name] = (value, None if ttl is None else now + ttl)
+        return value
+    
     def get_lp_token_address(self) -> str:
         """获取 LP Token 地址"""
-        return self.contract.functions.LPToken().call()
+        return self._cached_view('LPToken')
     
     def get_jager_token_address(self) -> str:
         """获取 Jager Token 地址"""
-        return self.contract.functions.jagerToken().call()
+        return self._cached_view('jagerToken')
     
     def get_airdrop_address(self) -> str:
         """获取空投地址"""
-        return self.contract.functions.airdrop().call()
+        return self._cached_view('airdrop')
     
     def get_end_block(self) -> int:
         """获取结束区块"""
-        return self.contract.functions.endBlock().call()
+        return self._cached_view('endBlock', ttl=_SLOW_VIEW_TTL)
     
     def get_lock_time(self) -> int:
         """获取锁定时间"""
-        return self.contract.functions.lockTime().call()
+        return self._cached_view('lockTime', ttl=_SLOW_VIEW_TTL)
     
     def get_release_block_number(self) -> int:
         """获取释放区块号"""
-        return self.contract.functions.releaseBlockNumber().call()
+        return self._cached_view('releaseBlockNumber', ttl=_SLOW_VIEW_TTL)
     
     def get_reward_per_block(self) -> int:
         """获取每区块奖励"""
-        return self.contract.functions.rewardPerBlock().call()
+        return self._cached_view('rewardPerBlock', ttl=_SLOW_VIEW_TTL)
+    
+    def get_block_time(self) -> float:
+        """获取最近 _BLOCK_TIME_SAMPLE 个区块的平均出块间隔（秒），结果缓存 _SLOW_VIEW_TTL 秒"""
+        now = time.monotonic()
+        if self._block_time is None or now >= self._block_time[1]:
+            latest = self.web3.eth.get_block('latest')
+            earlier = self.web3.eth.get_block(latest['number'] - _BLOCK_TIME_SAMPLE)
+            block_time = (latest['timestamp'] - earlier['timestamp']) / _BLOCK_TIME_SAMPLE
+            self._block_time = (block_time, now + _SLOW_VIEW_TTL)
+        return self._block_time[0]
     
     def get_pool_info(self) -> Dict[str, int]:
         """获取池子信息"""
@@ -74,17 +274,30 @@ class JagerContractInteraction:
         Args:
             account_address: 账户地址
         """
-        account_address = Web3.to_checksum_address(account_address)
-        return self.contract.functions.pendingReward(account_address).call()
+        # 同一账户的 calldata 不变，只拼接一次：选择器 + 左侧补零到 32 字节的地址，
+        # 不经过 ABI 编码和校验和计算，之后直接发送 eth_call
+        tx = self._pending_reward_calls.get(account_address)
+        if tx is None:
+            address_bytes = bytes.fromhex(account_address[2:])
+            if len(address_bytes) != 20:
+                raise Exception(f"无效的账户地址: {account_address}")
+            data = _PENDING_REWARD_SELECTOR + b'\x00' * 12 + address_bytes
+            tx = {'to': self.contract_address, 'data': '0x' + data.hex()}
+            self._pending_reward_calls[account_address] = tx
+        
+        raw = self.web3.eth.call(tx)
+        # 合约地址错误或连到了其他网络时会返回空数据，不能当作 0 处理
+        if len(raw) != 32:
+            raise Exception(f"pendingReward 返回数据长度异常（{len(raw)} 字节），请检查合约地址和 RPC 网络")
+        return int.from_bytes(raw, 'big')
     
-    def get_user_info(self, account_address: str) -> Dict[str, int]:
+    def get_user_info(self, account_address: ChecksumAddress) -> Dict[str, int]:
         """
         获取用户信息
         
         Args:
-            account_address: 账户地址
+            account_address: 账户地址，需已是校验和格式（可先用 Web3.to_checksum_address 转换一次）
         """
-        account_address = Web3.to_checksum_address(account_address)
         result = self.contract.functions.userInfo(account_address).call()
         return {
             "amount": result[0],
@@ -93,6 +306,102 @@ class JagerContractInteraction:
             "lockEndedTimestamp": result[3]
         }
     
+    def _batch_rpc(self, calls: List[Tuple[str, List[Any]]]) -> Optional[List[Any]]:
+        """
+        将多个 JSON-RPC 请求合并为一次 HTTP POST 发送
+        
+        Args:
+            calls: [(方法名, 参数列表)]
+        
+        Returns:
+            与 calls 顺序一致的结果列表；节点不支持批量请求时返回 None
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        
+        # 只发往支持批量请求的节点，都不支持时直接让调用方逐个查询
+        endpoints = [endpoint for endpoint in self.provider.endpoints if endpoint["batch_supported"]]
+        if not endpoints:
+            return None
+        
+        def post(endpoint: Dict[str, Any]) -> Any:
+            response = self.session.post(endpoint["url"], json=payload, **self.provider.request_kwargs)
+            # 429 是限流，按节点故障处理；其他 4xx 说明节点拒绝批量请求，节点本身可用
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                endpoint["batch_supported"] = False
+                return None
+            response.raise_for_status()
+            # 在 route 内解析，返回内容无法解析时同样切换节点
+            items = _json_loads(response.content)
+            if _is_unavailable_error(items):
+                raise _EndpointUnavailable(f"RPC 节点 {endpoint['url']} 暂时不可用: {items['error']}")
+            if not isinstance(items, list):
+                endpoint["batch_supported"] = False
+                return None
+            return items
+        
+        items = self.provider.route(post, endpoints)
+        if items is None:
+            return None
+        
+        # 节点返回的顺序不一定与请求一致，按 id 对齐
+        results = [None] * len(payload)
+        for item in items:
+            request_id = item.get("id")
+            # 整个批量请求无法解析时，节点返回的错误对象 id 为 null
+            if not isinstance(request_id, int) or not 0 <= request_id < len(payload):
+                raise Exception(f"RPC 批量请求失败: {item.get('error', item)}")
+            if "error" in item:
+                raise Exception(f"RPC 请求 {payload[request_id]['method']} 失败: {item['error']}")
+            results[request_id] = item["result"]
+        
+        if any(result is None for result in results):
+            raise Exception("RPC 批量请求的响应不完整")
+        return results
+    
+    def _get_tx_params(self, address: str) -> Tuple[int, int, int]:
+        """
+        获取发送交易所需的 chainId、gasPrice 和 nonce
+        
+        chainId 永久缓存，gasPrice 缓存 _GAS_PRICE_TTL 秒，nonce 在本地递增；
+        缓存失效的项合并为一次 JSON-RPC 批量请求查询，节点不支持批量请求时逐个查询。
+        
+        Args:
+            address: 发送交易的地址
+        """
+        now = time.monotonic()
+        calls = []
+        if self._chain_id is None:
+            calls.append(("eth_chainId", []))
+        if self._gas_price is None or now >= self._gas_price[1]:
+            calls.append(("eth_gasPrice", []))
+        if self._nonce is None:
+            calls.append(("eth_getTransactionCount", [address, "pending"]))
+        
+        if calls:
+            methods = [method for method, _ in calls]
+            results = self._batch_rpc(calls)
+            if results is None:
+                fallback = {
+                    "eth_chainId": lambda: self.web3.eth.chain_id,
+                    "eth_gasPrice": lambda: self.web3.eth.gas_price,
+                    "eth_getTransactionCount": lambda: self.web3.eth.get_transaction_count(address, "pending"),
+                }
+                values = {method: fallback[method]() for method in methods}
+            else:
+                values = {method: int(result, 16) for method, result in zip(methods, results)}
+            
+            if "eth_chainId" in values:
+                self._chain_id = values["eth_chainId"]
+            if "eth_gasPrice" in values:
+                self._gas_price = (values["eth_gasPrice"], now + _GAS_PRICE_TTL)
+            if "eth_getTransactionCount" in values:
+                self._nonce = values["eth_getTransactionCount"]
+        
+        return self._chain_id, self._gas_price[0], self._nonce
+    
     def _build_and_send_tx(self, function, value=0):
         """
         构建并发送交易
@@ -104,45 +413,43 @@ class JagerContractInteraction:
         if not self.private_key:
             raise Exception("需要提供私钥才能发送交易")
         
-        account = self.web3.eth.account.from_key(self.private_key)
-        address = account.address
+        address = self.account.address
+        
+        # 预估 gas，交易会 revert 时在这里直接报错，不会消耗 nonce
+        gas = int(function.estimate_gas({'from': address, 'value': value}) * _GAS_LIMIT_MULTIPLIER)
         
-        # 获取 nonce
-        nonce = self.web3.eth.get_transaction_count(address)
+        # 获取 chainId、gasPrice 和 nonce
+        chain_id, gas_price, nonce = self._get_tx_params(address)
         
-        # 构建交易
+        # 构建交易（BSC 使用 legacy gasPrice）
         tx = function.build_transaction({
             'from': address,
             'value': value,
-            'gas': 2000000,  # 可以根据需要调整
-            'gasPrice': self.web3.eth.gas_price,
+            'gas': gas,
+            'gasPrice': gas_price,
             'nonce': nonce,
+            'chainId': chain_id,
         })
         
         # 签名交易
         signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
         
-        # 发送交易 - 兼容不同版本的 Web3.py
-        raw_tx = None
-        if hasattr(signed_tx, 'rawTransaction'):
-            raw_tx = signed_tx.rawTransaction
-        elif hasattr(signed_tx, 'raw_transaction'):
-            raw_tx = signed_tx.raw_transaction
-        else:
-            # 尝试获取原始交易数据
-            for attr_name in dir(signed_tx):
-                if 'raw' in attr_name.lower() and not attr_name.startswith('_'):
-                    raw_tx = getattr(signed_tx, attr_name)
-                    break
-        
-        if not raw_tx:
-            raise Exception("无法获取签名交易的原始数据，请检查 Web3.py 版本")
-        
-        # 发送交易
-        tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
+        raw_tx = getattr(signed_tx, _RAW_TX_ATTR)
+        
+        # 发送交易，失败时清空本地 nonce，下次重新从链上获取
+        try:
+            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
+        except Exception:
+            self._nonce = None
+            raise
+        self._nonce = nonce + 1
         
         # 等待交易确认
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        try:
+            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=_RECEIPT_POLL_LATENCY)
+        except Exception:
+            self._nonce = None
+            raise
         
         return receipt
     
@@ -202,43 +509,59 @@ class JagerContractInteraction:
 if __name__ == "__main__":
     # 配置参数
     CONTRACT_ADDRESS = "0x5C08E98F14e462B75C9b3566128f75915B78aee7"  # 替换为实际合约地址
-    BSC_RPC_URL = "bsc主网RPC"  # BSC 主网 RPC
-    # BSC_RPC_URL = "https://data-seed-prebsc-1-s1.binance.org:8545/"  # BSC 测试网 RPC
+    # BSC 主网 RPC，可以填写多个，程序会自动选择延迟最低的可用节点
+    BSC_RPC_URLS = ["bsc主网RPC"]
+    # BSC_RPC_URLS = ["https://data-seed-prebsc-1-s1.binance.org:8545/"]  # BSC 测试网 RPC
     PRIVATE_KEY = "你的私钥"
     #你想要大于多少奖励的时候领一次，单位是M(百万)
     reward = 13784
+    # 领取阈值换算成 wei，用整数比较避免浮点精度损失
+    threshold_wei = reward * 10**18 * 10**6
+    # 你要查询的地址，只在启动时做一次校验和转换
+    user_address = Web3.to_checksum_address("你的地址")
+    # 默认查询间隔和按出块估算时的最长等待时间（秒）
+    POLL_INTERVAL = 60
+    MAX_POLL_INTERVAL = 600
     
     # 初始化合约交互对象
     jager = JagerContractInteraction(
         contract_address=CONTRACT_ADDRESS,
-        rpc_url=BSC_RPC_URL,
+        rpc_url=BSC_RPC_URLS,
         private_key=PRIVATE_KEY  # 仅查询不需要私钥
     )
-    pending = 0
+    lp_token = None
     while True:
+        wait_seconds = POLL_INTERVAL
          # 查询示例
         try:
-            # 获取 LP Token 地址
-            lp_token = jager.get_lp_token_address()
-            print(f"LP Token 地址: {lp_token}")
-            
-            # 获取用户信息 (替换为你要查询的地址)
-            user_address = "你的地址"
+            # LP Token 地址不会变化，查询成功一次后不再查询
+            if lp_token is None:
+                lp_token = jager.get_lp_token_address()
+                print(f"LP Token 地址: {lp_token}")
+                print(f"平均出块间隔: {jager.get_block_time():.2f}秒")
             
             # 获取待领取奖励
-            pending = jager.get_pending_reward(user_address)
-            pending = pending / 10**18 /1000000
-            print(f"待领取奖励: {pending:.2f}")
-            if pending > reward :
+            # rewardPerBlock 和出块间隔都已缓存，每轮通常只有这一次 eth_call，
+            # 没有可以并发的独立请求，因此保持同步调用，不使用 asyncio
+            pending_wei = jager.get_pending_reward(user_address)
+            print(f"待领取奖励: {pending_wei / 10**18 / 1000000:.2f}")
+            if pending_wei > threshold_wei:
                 print("开始领取奖励")
                 receipt = jager.claim()
                 print(f"存款交易哈希: {receipt.transactionHash.hex()}")
+            else:
+                # 个人奖励每个区块最多增加整个池子的 rewardPerBlock，
+                # 据此估算最少还需多少区块才能达到领取阈值，再按实测出块间隔换算成时间
+                reward_per_block = jager.get_reward_per_block()
+                if reward_per_block > 0:
+                    blocks_needed = (threshold_wei - pending_wei) // reward_per_block
+                    block_time = jager.get_block_time()
+                    wait_seconds = min(max(block_time, blocks_needed * block_time), MAX_POLL_INTERVAL)
             
         except Exception as e:
             print(f"发生错误: {e}")
         
-        print("等待60秒,减少RPC的负担")
-        time.sleep(60)
+        print(f"等待{wait_seconds:.1f}秒,减少RPC的负担")
+        time.sleep(wait_seconds)
         
     
-    
\ No newline at end of file